@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models.schemas import ChangeEvent, FieldChange, WatchItem
+
+# Fields that change on every scrape without the page itself changing
+VOLATILE_FIELDS = {
+    "timestamp",
+    "scraped_at",
+    "collected_at",
+    "crawled_at",
+    "input",
+    "discovery_input",
+    "request_id",
+    "snapshot_id",
+}
+
+# Fields reported individually in change events when present in a result
+TRACKED_FIELDS = [
+    "final_price",
+    "initial_price",
+    "price",
+    "currency",
+    "availability",
+    "is_available",
+    "rating",
+    "reviews_count",
+    "followers",
+    "employees_in_linkedin",
+    "title",
+]
+
+# Adaptive interval factors: volatile items are checked sooner, static ones backed off
+SHRINK_ON_CHANGE = 0.5
+GROW_ON_UNCHANGED = 1.5
+
+# WatchItem fields owned by the monitor; everything else is owned by add/remove
+MONITOR_FIELDS = (
+    "interval",
+    "next_check",
+    "last_checked",
+    "last_changed",
+    "fingerprint",
+    "snapshot",
+    "checks",
+    "changes",
+)
+
+ToolCaller = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+def _extract_payload(result: Any) -> Any:
+    """Unwrap an MCP tools/call result into the underlying data."""
+    if isinstance(result, dict) and "content" in result:
+        texts = [c.get("text", "") for c in result["content"] if c.get("type") == "text"]
+        result = "\n".join(texts)
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except json.JSONDecodeError:
+            return {"content": re.sub(r"\s+", " ", result).strip()}
+    if isinstance(result, list) and len(result) == 1:
+        result = result[0]
+    if not isinstance(result, dict):
+        return {"content": result}
+    return result
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def normalize_result(result: Any) -> Dict[str, Any]:
+    """Normalize a tool result so that equal content gives equal output."""
+    return _strip_volatile(_extract_payload(result))
+
+
+def fingerprint(normalized: Dict[str, Any]) -> str:
+    """Stable content hash of a normalized result."""
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def diff_fields(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> List[FieldChange]:
+    """Compact field-level diff, preferring the tracked fields."""
+    old = old or {}
+    changes = [
+        FieldChange(field=f, old=old.get(f), new=new.get(f))
+        for f in TRACKED_FIELDS
+        if (f in old or f in new) and old.get(f) != new.get(f)
+    ]
+    if changes:
+        return changes
+    # Nothing tracked changed: report which other top-level keys did, without values
+    keys = sorted(set(old) | set(new))
+    return [FieldChange(field=k) for k in keys if old.get(k) != new.get(k)]
+
+
+class Watchlist:
+    """Persistent set of watched tool calls, stored as JSON."""
+    def __init__(self, path: str):
+        self.path = path
+        self.items: Dict[str, WatchItem] = {}
+        self.load()
+
+    def _read(self) -> Dict[str, WatchItem]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            data = json.load(f)
+        items = {}
+        for raw in data.get("items", []):
+            item = WatchItem(**raw)
+            items[item.key] = item
+        return items
+
+    def load(self):
+        self.items = self._read()
+
+    def save(self, updated: Optional[Iterable[WatchItem]] = None):
+        """Write the watchlist.
+
+        With updated, only the monitor-owned fields of those items are merged
+        into what is on disk, so add/remove edits made meanwhile survive.
+        """
+        if updated is not None:
+            items = self._read()
+            for item in updated:
+                if item.key in items:
+                    for field in MONITOR_FIELDS:
+                        setattr(items[item.key], field, getattr(item, field))
+            self.items = items
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"items": [i.model_dump() for i in self.items.values()]}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def add(self, tool: str, arguments: Dict[str, Any], interval: Optional[float] = None, **kwargs) -> Tuple[WatchItem, bool]:
+        """Add an item, or update the interval of an existing one; returns (item, created)."""
+        item = WatchItem(tool=tool, arguments=arguments, **kwargs)
+        created = item.key not in self.items
+        item = self.items.setdefault(item.key, item)
+        if interval is not None:
+            item.interval = min(item.max_interval, max(item.min_interval, interval))
+            if not created and item.last_checked is not None:
+                item.next_check = item.last_checked + item.interval
+        elif created:
+            item.interval = min(item.max_interval, max(item.min_interval, item.interval))
+        return item, created
+
+    def remove(self, key: str) -> bool:
+        return self.items.pop(key, None) is not None
+
+    def due(self, now: Optional[float] = None) -> List[WatchItem]:
+        now = time.time() if now is None else now
+        return sorted((i for i in self.items.values() if i.next_check <= now), key=lambda i: i.next_check)
+
+
+class ChangeMonitor:
+    """Re-checks watched items and emits only the ones whose content changed."""
+    def __init__(self, watchlist: Watchlist, call_tool: ToolCaller, max_concurrency: int = 4):
+        self.watchlist = watchlist
+        self.call_tool = call_tool
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _reschedule(self, item: WatchItem, changed: bool, now: float):
+        factor = SHRINK_ON_CHANGE if changed else GROW_ON_UNCHANGED
+        item.interval = min(item.max_interval, max(item.min_interval, item.interval * factor))
+        item.next_check = now + item.interval
+
+    async def check(self, item: WatchItem) -> Optional[ChangeEvent]:
+        """Scrape one item; return a ChangeEvent if its content changed."""
+        async with self.semaphore:
+            result = await self.call_tool(item.tool, item.arguments)
+        now = time.time()
+        item.last_checked = now
+        item.checks += 1
+        if result is None or (isinstance(result, dict) and result.get("isError")):
+            # Failed scrape (incl. MCP error results such as "snapshot not ready"):
+            # retry at the current interval without touching the snapshot
+            item.next_check = now + item.interval
+            return None
+
+        normalized = normalize_result(result)
+        digest = fingerprint(normalized)
+        if digest == item.fingerprint:
+            self._reschedule(item, changed=False, now=now)
+            return None
+
+        first_check = item.fingerprint is None
+        event = ChangeEvent(
+            key=item.key,
+            tool=item.tool,
+            arguments=item.arguments,
+            timestamp=now,
+            fingerprint=digest,
+            previous_fingerprint=item.fingerprint,
+            changes=diff_fields(item.snapshot, normalized),
+        )
+        item.fingerprint = digest
+        item.snapshot = normalized
+        item.last_changed = now
+        if first_check:
+            # Baseline capture is not a change; keep the configured interval
+            item.next_check = now + item.interval
+            return None
+        item.changes += 1
+        self._reschedule(item, changed=True, now=now)
+        return event
+
+    async def run_once(self) -> List[ChangeEvent]:
+        """Check every due item and persist the watchlist."""
+        # Pick up items added or removed since the last pass
+        self.watchlist.load()
+        due = self.watchlist.due()
+        results = await asyncio.gather(*(self.check(i) for i in due), return_exceptions=True)
+        events = []
+        for item, res in zip(due, results):
+            if isinstance(res, Exception):
+                print(f"[ChangeMonitor][ERROR] {item.key}: {res}")
+                item.next_check = time.time() + item.interval
+            elif res is not None:
+                events.append(res)
+        self.watchlist.save(updated=due)
+        return events
+
+    async def run_forever(self, on_event: Callable[[ChangeEvent], Any], idle_sleep: float = 60.0):
+        """Loop over due items, handing change events to on_event."""
+        while True:
+            for event in await self.run_once():
+                out = on_event(event)
+                if asyncio.iscoroutine(out):
+                    await out
+            upcoming = [i.next_check for i in self.watchlist.items.values()]
+            wait = min(upcoming) - time.time() if upcoming else idle_sleep
+            await asyncio.sleep(max(1.0, min(wait, idle_sleep)))
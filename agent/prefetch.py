@@ -0,0 +1,126 @@
+import asyncio
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from models.tool_validation import canonical_url
+
+ASIN_RE = re.compile(r"\bASIN[:\s]*([A-Z0-9]{10})\b", re.IGNORECASE)
+AMAZON_DP_RE = re.compile(r"/(?:dp|gp/product)/([A-Z0-9]{10})", re.IGNORECASE)
+URL_RE = re.compile(r"https?://[^\s<>\"')\]]+")
+SEARCH_RE = re.compile(
+    r"^\s*(?:please\s+)?search\s+(?:(google|bing|yandex)\s+)?(?:for\s+)?(.+?)\s*[.?!]?\s*$",
+    re.IGNORECASE,
+)
+
+
+def call_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Key identifying equivalent tool calls, tolerant of formatting differences."""
+    args = dict(arguments)
+    if tool_name == "web_data_amazon_product" and "url" in args:
+        match = AMAZON_DP_RE.search(args["url"])
+        host = urlsplit(args["url"]).netloc.lower().removeprefix("www.")
+        if match:
+            return f"{tool_name}:{host}:{match.group(1).upper()}"
+    if "url" in args:
+        args["url"] = canonical_url(args["url"], strip_trailing_slash=True)
+    if tool_name == "search_engine":
+        args["query"] = " ".join(str(args.get("query", "")).lower().split())
+        args["engine"] = args.get("engine") or "google"
+    return f"{tool_name}:{json.dumps(args, sort_keys=True)}"
+
+
+def detect_tool_calls(text: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Guess the obvious tool calls for a user message using local patterns."""
+    calls = []
+    seen_asins = set()
+    for url in URL_RE.findall(text):
+        url = url.rstrip(".,;")
+        host = urlsplit(url).netloc.lower()
+        dp = AMAZON_DP_RE.search(url)
+        if "amazon." in host and dp:
+            seen_asins.add(dp.group(1).upper())
+            calls.append(("web_data_amazon_product", {"url": url}))
+        elif "linkedin.com" in host and "/in/" in url:
+            calls.append(("web_data_linkedin_person_profile", {"url": url}))
+        elif "linkedin.com" in host and "/company/" in url:
+            calls.append(("web_data_linkedin_company_profile", {"url": url}))
+        else:
+            calls.append(("scrape_as_markdown", {"url": url}))
+
+    for asin in ASIN_RE.findall(text):
+        asin = asin.upper()
+        if asin not in seen_asins:
+            seen_asins.add(asin)
+            calls.append(("web_data_amazon_product", {"url": f"https://www.amazon.com/dp/{asin}"}))
+
+    if not calls:
+        match = SEARCH_RE.match(text)
+        if match:
+            engine = (match.group(1) or "google").lower()
+            calls.append(("search_engine", {"query": match.group(2), "engine": engine}))
+    return calls
+
+
+class Prefetcher:
+    """Starts likely tool calls alongside the first LLM request and serves them on demand."""
+    def __init__(self, tools: List[BaseTool]):
+        self.tools = {tool.name: tool for tool in tools}
+        self.pending: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.hits = 0
+        self.wasted = 0
+
+    def wrap_tools(self) -> List[BaseTool]:
+        """Return tools that consume a matching prefetch before calling BrightData."""
+        return [self._wrap(tool) for tool in self.tools.values()]
+
+    def _wrap(self, tool: BaseTool) -> BaseTool:
+        async def run(**kwargs):
+            task = self.pending.pop(call_key(tool.name, kwargs), None)
+            if task is not None:
+                self.hits += 1
+                return await task
+            return await tool.coroutine(**kwargs)
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            coroutine=run,
+            response_format=tool.response_format,
+            metadata=tool.metadata,
+        )
+
+    def start(self, text: str) -> int:
+        """Launch prefetches for text; returns how many were started."""
+        count = 0
+        for name, arguments in detect_tool_calls(text):
+            tool = self.tools.get(name)
+            key = call_key(name, arguments)
+            if tool is None or key in self.pending:
+                continue
+            self.pending[key] = asyncio.create_task(tool.coroutine(**arguments))
+            self.started += 1
+            count += 1
+        return count
+
+    def cancel_unused(self):
+        """Cancel prefetches the agent never asked for."""
+        for task in self.pending.values():
+            if task.done() and not task.cancelled():
+                task.exception()  # mark retrieved so failures don't log at shutdown
+            task.cancel()
+        self.wasted += len(self.pending)
+        self.pending.clear()
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        return self.hits / self.started if self.started else None
+
+    def stats(self) -> str:
+        rate = "n/a" if self.hit_rate is None else f"{self.hit_rate:.0%}"
+        return f"prefetch started={self.started} hits={self.hits} wasted={self.wasted} hit_rate={rate}"
@@ -1,8 +1,10 @@
-import os
 from openai import AsyncOpenAI
 from pydantic import BaseModel
 from typing import List, Optional
 
+from llm.pool import get_openai_client, get_rate_limiter, throttled_request
+from llm.rate_limit import TokenBucketLimiter, estimate_tokens
+
 class Message(BaseModel):
     role: str
     content: str
@@ -14,10 +16,27 @@ class CompletionResult(BaseModel):
     tool_calls: Optional[List] = None
 
 class OpenAIClient:
-    def __init__(self, model: str = "gpt-4.1-2025-04-14"):
-        api_key = os.getenv("OPENAI_API_KEY")
-        self.client = AsyncOpenAI(api_key=api_key)
+    def __init__(
+        self,
+        model: str = "gpt-4.1-2025-04-14",
+        client: Optional[AsyncOpenAI] = None,
+        limiter: Optional[TokenBucketLimiter] = None,
+        max_retries: int = 5,
+    ):
+        # Shared pooled client and limiter unless explicitly overridden
+        self.client = client or get_openai_client()
+        self.limiter = limiter or get_rate_limiter()
         self.model = model
+        self.max_retries = max_retries
+
+    async def _create(self, estimate: int, **kwargs):
+        """Throttled create call with retries for 429s and transient errors."""
+        return await throttled_request(
+            lambda: self.client.chat.completions.create(**kwargs),
+            estimate,
+            self.limiter,
+            self.max_retries,
+        )
 
     async def chat(self, messages: List[dict], stream: bool = False, tools: List[dict] = None) -> CompletionResult:
         kwargs = {
@@ -27,25 +46,40 @@ class OpenAIClient:
         }
         if tools:
             kwargs["tools"] = tools
+        if stream:
+            # Ask for a final usage chunk so the limiter can settle streamed calls too
+            kwargs["stream_options"] = {"include_usage": True}
             
-        response = await self.client.chat.completions.create(**kwargs)
+        reserved, response = await self._create(estimate_tokens(messages, tools), **kwargs)
         
         # Si stream=True, response es un generador async
         if stream:
             collected = []
-            async for chunk in response:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    collected.append(chunk.choices[0].delta.content)
+            usage = None
+            try:
+                async for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        collected.append(chunk.choices[0].delta.content)
+                    if chunk.usage:
+                        usage = chunk.usage.dict()
+            finally:
+                # A stream that breaks off before the usage chunk must not keep its reservation
+                if usage:
+                    self.limiter.settle(reserved, usage.get("total_tokens"))
+                else:
+                    self.limiter.refund(reserved)
             content = ''.join(collected)
-            return CompletionResult(messages=[Message(role="assistant", content=content)])
+            return CompletionResult(messages=[Message(role="assistant", content=content)], usage=usage)
         else:
             message = response.choices[0].message
             content = message.content
             tool_calls = message.tool_calls if hasattr(message, 'tool_calls') else None
+            usage = response.usage.dict() if response.usage else None
+            self.limiter.settle(reserved, usage.get("total_tokens") if usage else None)
             
             return CompletionResult(
                 messages=[Message(role="assistant", content=content or "")],
-                usage=response.usage.dict() if response.usage else None,
+                usage=usage,
                 model=response.model,
                 tool_calls=tool_calls
             )
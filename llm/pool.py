@@ -0,0 +1,142 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+import httpx
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from llm.rate_limit import TokenBucketLimiter, estimate_tokens, parse_retry_after
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Process-wide singletons shared by every OpenAIClient and the LangChain model
+_http_client: Optional[httpx.AsyncClient] = None
+_openai_client: Optional[AsyncOpenAI] = None
+_limiter: Optional[TokenBucketLimiter] = None
+
+# Non-429 statuses worth retrying, as the OpenAI SDK does
+RETRYABLE_STATUS = {408, 409}
+MAX_BACKOFF = 30.0
+
+T = TypeVar("T")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP/2 keep-alive transport for all LLM traffic."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        limits = httpx.Limits(
+            max_connections=int(_env_float("OPENAI_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(_env_float("OPENAI_MAX_KEEPALIVE", 20)),
+            keepalive_expiry=_env_float("OPENAI_KEEPALIVE_EXPIRY", 60.0),
+        )
+        timeout = httpx.Timeout(_env_float("OPENAI_TIMEOUT", 600.0), connect=5.0)
+        _http_client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=timeout)
+    return _http_client
+
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Shared RPM/TPM limiter configured from OPENAI_RPM and OPENAI_TPM."""
+    global _limiter
+    if _limiter is None:
+        _limiter = TokenBucketLimiter.from_env()
+    return _limiter
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI; retries go through throttled_request so the limiter sees them."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=get_http_client(),
+            max_retries=0,
+        )
+    return _openai_client
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """Seconds before retrying error, or None if it should not be retried."""
+    backoff = min(0.5 * 2 ** attempt, MAX_BACKOFF)
+    if isinstance(error, APIConnectionError):  # includes APITimeoutError
+        return backoff
+    if isinstance(error, (RateLimitError, InternalServerError)) or (
+        isinstance(error, APIStatusError) and error.status_code in RETRYABLE_STATUS
+    ):
+        return parse_retry_after(error.response.headers) or backoff
+    return None
+
+
+async def throttled_request(
+    request: Callable[[], Awaitable[T]],
+    estimate: int,
+    limiter: Optional[TokenBucketLimiter] = None,
+    max_retries: int = 5,
+) -> Tuple[int, T]:
+    """Run request under the shared limiter, retrying transient errors.
+
+    Returns the token reservation along with the response; the caller settles it
+    once usage is known. A 429 pauses every caller for its Retry-After.
+    """
+    limiter = limiter or get_rate_limiter()
+    for attempt in range(max_retries + 1):
+        reserved = await limiter.acquire(estimate)
+        try:
+            return reserved, await request()
+        except Exception as e:
+            limiter.refund(reserved)
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt == max_retries:
+                raise
+            if isinstance(e, RateLimitError):
+                # The next acquire() waits out the pause along with everyone else
+                limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def get_chat_model(model: str, **kwargs: Any):
+    """ChatOpenAI bound to the shared transport, limiter and retry policy."""
+    from langchain_openai import ChatOpenAI
+
+    class SharedChatOpenAI(ChatOpenAI):
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kw):
+            # Each call reserves and settles its own tokens, so concurrent runs can't mix them up
+            limiter = get_rate_limiter()
+            estimate = estimate_tokens(messages, kw.get("tools"))
+            reserved, result = await throttled_request(
+                lambda: super(SharedChatOpenAI, self)._agenerate(messages, stop=stop, run_manager=run_manager, **kw),
+                estimate,
+                limiter,
+            )
+            usage = (result.llm_output or {}).get("token_usage") or {}
+            limiter.settle(reserved, usage.get("total_tokens"))
+            return result
+
+    return SharedChatOpenAI(
+        model=model,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_async_client=get_http_client(),
+        # SDK retries would bypass the limiter; throttled_request retries instead
+        max_retries=0,
+        **kwargs,
+    )
+
+
+async def aclose():
+    """Close the shared transport (call once at shutdown)."""
+    global _http_client, _openai_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _openai_client = None
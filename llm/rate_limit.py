@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, List, Optional
+
+# Rough chars-per-token ratio used to size a request before the API reports usage
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(messages: List[Any], tools: Optional[List[dict]] = None, completion: int = 512) -> int:
+    """Cheap upper-bound style guess of a request's total tokens."""
+    prompt = json.dumps(messages, default=str)
+    if tools:
+        prompt += json.dumps(tools, default=str)
+    return len(prompt) // CHARS_PER_TOKEN + completion
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """Seconds to wait according to Retry-After / retry-after-ms headers."""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+class TokenBucketLimiter:
+    """Client-side requests-per-minute and tokens-per-minute throttle.
+
+    Callers reserve an estimated token count with acquire() and reconcile it with
+    the real usage via settle(), or give it back with refund() if the request
+    failed. Waiters are served in arrival order.
+    """
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = float(rpm or 0)
+        self.tokens = float(tpm or 0)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.estimate = 1000
+        self._lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_env(cls) -> "TokenBucketLimiter":
+        rpm = os.getenv("OPENAI_RPM")
+        tpm = os.getenv("OPENAI_TPM")
+        return cls(rpm=int(rpm) if rpm else None, tpm=int(tpm) if tpm else None)
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        if self.rpm:
+            self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60.0)
+        if self.tpm:
+            self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60.0)
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = max(0.0, self.blocked_until - time.monotonic())
+        if self.rpm and self.requests < 1:
+            wait = max(wait, (1 - self.requests) * 60.0 / self.rpm)
+        if self.tpm:
+            # A single request larger than the whole bucket only waits for a full bucket
+            needed = min(tokens, self.tpm)
+            if self.tokens < needed:
+                wait = max(wait, (needed - self.tokens) * 60.0 / self.tpm)
+        return wait
+
+    async def acquire(self, tokens: Optional[int] = None) -> int:
+        """Wait for capacity and reserve it; returns the reserved token count."""
+        tokens = tokens or self.estimate
+        if self._lock is None:
+            # Created lazily so the lock binds to the running event loop
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.rpm:
+                self.requests -= 1
+            if self.tpm:
+                self.tokens -= tokens
+        return tokens
+
+    def settle(self, reserved: int, used: Optional[int]):
+        """Replace a reservation with the usage the API actually reported."""
+        if used is None:
+            return
+        if self.tpm:
+            self.tokens += reserved - used
+        # Smooth estimate for callers that cannot size their own requests
+        self.estimate = int(0.8 * self.estimate + 0.2 * used)
+
+    def refund(self, reserved: int):
+        """Return a reservation whose request produced no usage (errors, 429s)."""
+        if self.tpm:
+            self.tokens = min(self.tpm, self.tokens + reserved)
+
+    def pause(self, seconds: float):
+        """Hold every caller back, e.g. after a 429 with Retry-After."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
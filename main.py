@@ -2,8 +2,9 @@ from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from langchain_mcp_adapters.tools import load_mcp_tools
 from langgraph.prebuilt import create_react_agent
-from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from agent.prefetch import Prefetcher
+from llm.pool import aclose as close_llm_pool, get_chat_model
 import asyncio
 import os
 import sys
@@ -16,7 +17,7 @@ warnings.filterwarnings("ignore")
 
 load_dotenv()
 
-model = ChatOpenAI(model="gpt-4.1-2025-04-14", api_key=os.getenv("OPENAI_API_KEY"))
+model = get_chat_model("gpt-4.1-2025-04-14")
 
 server_params = StdioServerParameters(
     command="npx",
@@ -69,7 +70,8 @@ async def chat_with_agent():
             async with ClientSession(read, write) as session:
                 await session.initialize()
                 tools = await load_mcp_tools(session)
-                agent = create_react_agent(model, tools)
+                prefetcher = Prefetcher(tools)
+                agent = create_react_agent(model, prefetcher.wrap_tools())
 
                 # Stop loading animation
                 stop_loading_animation()
@@ -112,8 +114,16 @@ async def chat_with_agent():
                         print("🤖 Processing", end="", flush=True)
                         dots = 0
                         
+                        # Start the obvious tool call now so it overlaps the first LLM request
+                        prefetcher.start(user_input)
+
                         # Call the agent with the full message history
-                        agent_response = await agent.ainvoke({"messages": messages})
+                        try:
+                            agent_response = await agent.ainvoke({"messages": messages})
+                        finally:
+                            prefetcher.cancel_unused()
+                            if os.getenv("DEBUG") == "1":
+                                print(f"\nDebug: {prefetcher.stats()}")
 
                         # Clear processing indicator
                         print("\r" + " " * 20 + "\r", end="", flush=True)
@@ -133,6 +143,7 @@ async def chat_with_agent():
                             print(f"Debug: {e}")
                             
     finally:
+        await close_llm_pool()
         # Restore stderr
         sys.stderr.close()
         sys.stderr = original_stderr
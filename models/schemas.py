@@ -1,8 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List, Callable
+from pydantic import BaseModel, PrivateAttr
+from typing import Optional, Dict, Any, List, Callable, Type
 import asyncio
 import json
 
+from models.tool_validation import ToolArgumentError, compile_validator, validate_arguments
+
 class ToolInput(BaseModel):
     name: str
     parameters: Optional[Dict[str, Any]] = None
@@ -28,7 +30,33 @@ class BrightDataTool(BaseModel):
     name: str
     description: str
     parameters: Dict[str, Any]
+    required: Optional[List[str]] = None
     executor: Optional[Callable[..., Any]] = None
+    _validator: Optional[Type[BaseModel]] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_mcp(cls, tool: Dict[str, Any], executor: Optional[Callable[..., Any]] = None) -> "BrightDataTool":
+        """Build a tool from a tools/list entry, keeping its inputSchema's required list."""
+        schema = tool.get("inputSchema") or {}
+        return cls(
+            name=tool["name"],
+            description=tool.get("description", ""),
+            parameters=schema.get("properties") or {},
+            required=schema.get("required") or [],
+            executor=executor,
+        )
+
+    @property
+    def required_parameters(self) -> List[str]:
+        # Without the schema's required list nothing is assumed required;
+        # BrightData's optional fields often have no default (e.g. search_engine.cursor)
+        return self.required or []
+
+    def validate_arguments(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Check and normalize arguments locally before paying for a BrightData call."""
+        if self._validator is None:
+            self._validator = compile_validator(self.name, self.parameters, self.required_parameters)
+        return validate_arguments(self.name, self._validator, arguments)
 
     async def execute(self, **kwargs) -> Any:
         if self.executor:
@@ -57,7 +85,7 @@ class OpenAIAgent:
                     "parameters": {
                         "type": "object",
                         "properties": tool.parameters,
-                        "required": list(tool.parameters.keys()) if tool.parameters else []
+                        "required": tool.required_parameters
                     }
                 }
             })
@@ -67,19 +95,27 @@ class OpenAIAgent:
         
         # Check if OpenAI wants to call a function
         if response.tool_calls:
+            # Every tool message must follow the assistant message that requested it
+            messages.append({
+                "role": "assistant",
+                "content": None,
+                "tool_calls": response.tool_calls
+            })
             # Execute the tool calls
             for tool_call in response.tool_calls:
                 tool_name = tool_call.function.name
-                arguments = json.loads(tool_call.function.arguments)
                 
                 try:
+                    try:
+                        arguments = json.loads(tool_call.function.arguments or "{}")
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"Arguments for '{tool_name}' are not valid JSON: {e}")
+                    if not isinstance(arguments, dict):
+                        raise ToolArgumentError(
+                            tool_name, [f"arguments must be a JSON object, got {type(arguments).__name__}"]
+                        )
                     result = await self.call_tool(tool_name, **arguments)
                     # Add tool result to conversation
-                    messages.append({
-                        "role": "assistant", 
-                        "content": None,
-                        "tool_calls": [tool_call]
-                    })
                     messages.append({
                         "role": "tool",
                         "tool_call_id": tool_call.id,
@@ -102,4 +138,40 @@ class OpenAIAgent:
         tool = self.tools.get(tool_name)
         if not tool:
             raise ValueError(f"Tool '{tool_name}' not found.")
-        return await tool.execute(**kwargs)
+        # Invalid calls fail here, before any request reaches BrightData
+        arguments = tool.validate_arguments(kwargs)
+        return await tool.execute(**arguments)
+
+class WatchItem(BaseModel):
+    """An entry in the change-monitoring watchlist"""
+    tool: str
+    arguments: Dict[str, Any]
+    interval: float = 3600.0
+    min_interval: float = 900.0
+    max_interval: float = 86400.0
+    next_check: float = 0.0
+    last_checked: Optional[float] = None
+    last_changed: Optional[float] = None
+    fingerprint: Optional[str] = None
+    snapshot: Optional[Dict[str, Any]] = None
+    checks: int = 0
+    changes: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.tool}:{json.dumps(self.arguments, sort_keys=True)}"
+
+class FieldChange(BaseModel):
+    field: str
+    old: Any = None
+    new: Any = None
+
+class ChangeEvent(BaseModel):
+    """Emitted by the monitor when a watched item's content changes"""
+    key: str
+    tool: str
+    arguments: Dict[str, Any]
+    timestamp: float
+    fingerprint: str
+    previous_fingerprint: Optional[str] = None
+    changes: List[FieldChange] = []
@@ -0,0 +1,108 @@
+from pydantic import BaseModel, BeforeValidator, ConfigDict, ValidationError, create_model, field_validator
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple, Type
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid"}
+
+def _reject_bool(value: Any) -> Any:
+    # Pydantic would otherwise accept True/False as 1/0
+    if isinstance(value, bool):
+        raise ValueError("Input should be a number, not a boolean")
+    return value
+
+JSON_TYPES = {
+    "string": str,
+    "integer": Annotated[int, BeforeValidator(_reject_bool)],
+    "number": Annotated[float, BeforeValidator(_reject_bool)],
+    "boolean": bool,
+    "object": Dict[str, Any],
+    "null": type(None),
+}
+
+class ToolArgumentError(ValueError):
+    """Raised when tool call arguments don't match the tool's input schema."""
+    def __init__(self, tool_name: str, errors: List[str]):
+        self.tool_name = tool_name
+        self.errors = errors
+        super().__init__(f"Invalid arguments for '{tool_name}': " + "; ".join(errors))
+
+def canonical_url(url: str, strip_trailing_slash: bool = False) -> str:
+    """Shared URL normalizer for dispatch and prefetch matching.
+
+    Trims, defaults to https, lowercases scheme/host and drops the fragment and
+    tracking params (utm_*, gclid, ...). The rest of the query is kept as is:
+    it often selects the page (?id=, ?v=).
+    """
+    url = url.strip().strip("<>\"'")
+    if "://" not in url:
+        url = "https://" + url.lstrip("/")
+    parts = urlsplit(url)
+    pairs = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [(k, v) for k, v in pairs if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS]
+    query = parts.query if len(kept) == len(pairs) else urlencode(kept)
+    path = parts.path or "/"
+    if strip_trailing_slash:
+        path = path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+def canonicalize_url(value: Any) -> Any:
+    """Validator form of canonical_url that rejects values without a host."""
+    if not isinstance(value, str):
+        return value
+    url = canonical_url(value)
+    netloc = urlsplit(url).netloc
+    if not netloc or "." not in netloc:
+        raise ValueError(f"not a valid URL: {value!r}")
+    return url
+
+def _python_type(prop: Dict[str, Any]) -> Any:
+    if "enum" in prop:
+        return Literal[tuple(prop["enum"])]
+    json_type = prop.get("type")
+    if isinstance(json_type, list):
+        types = [t for t in json_type if t != "null"]
+        inner = _python_type({**prop, "type": types[0]}) if len(types) == 1 else Any
+        return Optional[inner] if "null" in json_type else inner
+    if json_type == "array":
+        return List[_python_type(prop.get("items") or {})]
+    return JSON_TYPES.get(json_type, Any)
+
+def _is_url_field(name: str, prop: Dict[str, Any]) -> bool:
+    return prop.get("format") == "uri" or (prop.get("type") == "string" and name in {"url", "link"})
+
+def compile_validator(tool_name: str, properties: Dict[str, Any], required: List[str]) -> Type[BaseModel]:
+    """Build a Pydantic model for a tool's JSON-schema input, once per tool."""
+    fields: Dict[str, Tuple[Any, Any]] = {}
+    validators = {}
+    for name, prop in (properties or {}).items():
+        prop = prop or {}
+        annotation = _python_type(prop)
+        if name in required:
+            fields[name] = (annotation, ...)
+        else:
+            fields[name] = (Optional[annotation], prop.get("default"))
+        if _is_url_field(name, prop):
+            validators[f"_canonicalize_{name}"] = field_validator(name, mode="before")(
+                lambda cls, v: canonicalize_url(v)
+            )
+    model_name = "".join(part.title() for part in tool_name.replace("-", "_").split("_")) + "Args"
+    return create_model(
+        model_name,
+        __config__=ConfigDict(extra="forbid", str_strip_whitespace=True, coerce_numbers_to_str=True),
+        __validators__=validators,
+        **fields,
+    )
+
+def validate_arguments(tool_name: str, validator: Type[BaseModel], arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate and normalize arguments; only explicitly set, non-null values are kept."""
+    if not isinstance(arguments, dict):
+        raise ToolArgumentError(tool_name, [f"arguments must be a JSON object, got {type(arguments).__name__}"])
+    try:
+        parsed = validator.model_validate(arguments)
+    except ValidationError as e:
+        errors = []
+        for err in e.errors():
+            field = ".".join(str(p) for p in err["loc"]) or "<root>"
+            errors.append(f"{field}: {err['msg']}")
+        raise ToolArgumentError(tool_name, errors) from None
+    return parsed.model_dump(exclude_unset=True, exclude_none=True)
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from openai import AsyncOpenAI, BadRequestError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm.openai_client import OpenAIClient
+from llm.pool import throttled_request
+from llm.rate_limit import TokenBucketLimiter
+
+# Offline behaviour checks for the shared LLM limiter, using a mocked httpx transport.
+# Run: python scripts/check_rate_limiter.py
+
+failures = []
+
+def check(name: str, ok: bool, detail: str = ""):
+    print(f"{'✓' if ok else '❌'} {name}{f' ({detail})' if detail else ''}")
+    if not ok:
+        failures.append(name)
+
+def completion(total_tokens: int) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-test",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "ok"},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": total_tokens - 10, "completion_tokens": 10, "total_tokens": total_tokens},
+    }
+
+def mock_client(handler) -> AsyncOpenAI:
+    transport = httpx.MockTransport(handler)
+    return AsyncOpenAI(
+        api_key="test",
+        base_url="https://api.test/v1",
+        http_client=httpx.AsyncClient(transport=transport),
+        max_retries=0,
+    )
+
+async def check_429_pauses_every_caller():
+    limiter = TokenBucketLimiter()
+    hit = asyncio.Event()
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            hit.set()
+            return httpx.Response(429, headers={"retry-after-ms": "300"}, json={"error": {"message": "slow down"}})
+        return httpx.Response(200, json=completion(100))
+
+    client = mock_client(handler)
+
+    async def first():
+        start = time.monotonic()
+        await throttled_request(
+            lambda: client.chat.completions.create(model="gpt-test", messages=[]), 100, limiter
+        )
+        return time.monotonic() - start
+
+    async def other_caller():
+        await hit.wait()
+        await asyncio.sleep(0.02)  # let the 429 be handled
+        start = time.monotonic()
+        await limiter.acquire(1)
+        return time.monotonic() - start
+
+    first_wait, other_wait = await asyncio.gather(first(), other_caller())
+    check("429 retry-after-ms delays the retry", first_wait >= 0.28 and calls == 2, f"{first_wait:.2f}s, {calls} calls")
+    check("429 pause holds back other callers", other_wait >= 0.25, f"{other_wait:.2f}s")
+
+async def check_refund_on_error():
+    limiter = TokenBucketLimiter(tpm=600)
+
+    def handler(request):
+        return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+    client = mock_client(handler)
+    try:
+        await throttled_request(
+            lambda: client.chat.completions.create(model="gpt-test", messages=[]), 500, limiter
+        )
+        check("non-retryable error is raised", False)
+    except BadRequestError:
+        check("non-retryable error is raised", True)
+    check("failed request refunds its reservation", limiter.tokens >= 599, f"{limiter.tokens:.0f} tokens left")
+    check("refund leaves the estimate alone", limiter.estimate == 1000, f"estimate {limiter.estimate}")
+
+async def check_settle_reconciles_usage():
+    limiter = TokenBucketLimiter(tpm=6000)
+
+    def handler(request):
+        return httpx.Response(200, json=completion(300))
+
+    client = OpenAIClient(model="gpt-test", client=mock_client(handler), limiter=limiter)
+    messages = [{"role": "user", "content": "x" * 4000}]
+    result = await client.chat(messages)
+    # Reserved ~1500 estimated tokens, API reported 300: only 300 stay spent
+    check("usage is returned", result.usage["total_tokens"] == 300)
+    check("settle replaces the estimate with real usage", 5690 <= limiter.tokens <= 5710, f"{limiter.tokens:.0f} tokens left")
+
+async def check_rpm_wait():
+    limiter = TokenBucketLimiter(rpm=120)  # one request every 0.5s once drained
+    limiter.requests = 0
+    limiter.updated = time.monotonic()
+    start = time.monotonic()
+    await limiter.acquire(1)
+    waited = time.monotonic() - start
+    check("empty RPM bucket waits for the next slot", 0.45 <= waited <= 0.7, f"{waited:.2f}s")
+
+async def main():
+    await check_429_pauses_every_caller()
+    await check_refund_on_error()
+    await check_settle_reconciles_usage()
+    await check_rpm_wait()
+    if failures:
+        print(f"\nFAILED: {len(failures)} check(s)")
+        sys.exit(1)
+    print("\nAll rate limiter checks passed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from dotenv import load_dotenv
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.monitor import ChangeMonitor, Watchlist
+
+load_dotenv()
+
+DEFAULT_WATCHLIST = "watchlist.json"
+
+def print_event(event):
+    print(event.model_dump_json())
+
+async def run(watchlist: Watchlist, once: bool, concurrency: int):
+    server_params = StdioServerParameters(
+        command="npx",
+        env={
+            "API_TOKEN": os.getenv("API_TOKEN"),
+            "BROWSER_AUTH": os.getenv("BROWSER_AUTH"),
+            "WEB_UNLOCKER_ZONE": os.getenv("WEB_UNLOCKER_ZONE"),
+        },
+        args=["@brightdata/mcp"],
+    )
+    async with stdio_client(server_params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+
+            async def call_tool(name, arguments):
+                # ClientSession matches replies by request id, so calls may overlap
+                result = await session.call_tool(name, arguments)
+                return result.model_dump()
+
+            monitor = ChangeMonitor(watchlist, call_tool, max_concurrency=concurrency)
+            if once:
+                for event in await monitor.run_once():
+                    print_event(event)
+            else:
+                await monitor.run_forever(print_event)
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch BrightData tool results and emit only changes")
+    parser.add_argument("--watchlist", default=DEFAULT_WATCHLIST)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="Add a tool call to the watchlist")
+    add.add_argument("tool", help="e.g. web_data_amazon_product")
+    add.add_argument("arguments", help='JSON arguments, e.g. \'{"url": "https://www.amazon.com/dp/B07NJG12GB"}\'')
+    add.add_argument("--interval", type=float, default=None, help="Initial refresh interval in seconds (clamped to the item's min/max)")
+
+    remove = sub.add_parser("remove", help="Remove an item by key")
+    remove.add_argument("key")
+
+    sub.add_parser("list", help="Show watched items")
+
+    run_parser = sub.add_parser("run", help="Start monitoring")
+    run_parser.add_argument("--once", action="store_true", help="Check due items once and exit")
+    run_parser.add_argument("--concurrency", type=int, default=4, help="Max scrapes in flight")
+
+    args = parser.parse_args()
+    watchlist = Watchlist(args.watchlist)
+
+    if args.command == "add":
+        item, created = watchlist.add(args.tool, json.loads(args.arguments), interval=args.interval)
+        watchlist.save()
+        if created:
+            print(f"Watching {item.key} every {item.interval:.0f}s")
+        else:
+            print(f"Already watching {item.key} (interval {item.interval:.0f}s)")
+    elif args.command == "remove":
+        if watchlist.remove(args.key):
+            watchlist.save()
+            print(f"Removed {args.key}")
+        else:
+            print(f"Not found: {args.key}")
+    elif args.command == "list":
+        for item in watchlist.items.values():
+            print(f"{item.key}  interval={item.interval:.0f}s checks={item.checks} changes={item.changes}")
+    elif args.command == "run":
+        asyncio.run(run(watchlist, args.once, args.concurrency))
+
+if __name__ == "__main__":
+    main()